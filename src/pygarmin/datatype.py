@@ -4,6 +4,12 @@ import rawutil
 import re
 from . import logger as mod_logger
 
+# Conversion factors between semicircles, radians and degrees
+_SEMICIRCLES_TO_RADIANS = math.pi / 2 ** 31
+_RADIANS_TO_DEGREES = 180 / math.pi
+_RADIANS_TO_SEMICIRCLES = 2 ** 31 / math.pi
+_DEGREES_TO_RADIANS = math.pi / 180
+
 
 class DataType():
     """Base datatype.
@@ -28,41 +34,58 @@ class DataType():
     re_upcase_digit_space_hyphen = r'[A-Z0-9 _]'
     #: regex matching any ASCII character
     re_ascii = r'[\x20-\x7E]'
+    # compiled regexes used by is_valid_charset, keyed by pattern
+    _charset_regex = {}
 
     @classmethod
     def get_keys(cls):
         """Return the list of keys of the structure fields.
 
+        The keys are computed once and cached on the class.
+
         :return: list of _field keys
         :rtype: list[str]
 
         """
-        keys = list(zip(*cls._fields))[0]
+        keys = cls.__dict__.get('_keys')
+        if keys is None:
+            keys = list(zip(*cls._fields))[0]
+            cls._keys = keys
         return keys
 
     @classmethod
     def get_format(cls):
         """Return the format string of the structure fields.
 
+        The format string is computed once and cached on the class.
+
         :return: ``rawutil`` format string
         :rtype: str
 
         """
-        fmt_chars = list(zip(*cls._fields))[1]
-        fmt = ' '.join(fmt_chars)
+        fmt = cls.__dict__.get('_fmt')
+        if fmt is None:
+            fmt_chars = list(zip(*cls._fields))[1]
+            fmt = ' '.join(fmt_chars)
+            cls._fmt = fmt
         return fmt
 
     @classmethod
     def get_struct(cls):
         """Return a ``rawutil.Struct`` object with the structure fields.
 
+        The struct is compiled once and cached on the class.
+
         :return: struct object
         :rtype: ``rawutil.Struct``
 
         """
-        struct = rawutil.Struct(cls.get_format(),
-                                names=cls.get_keys())
-        struct.setbyteorder(cls.byteorder)
+        struct = cls.__dict__.get('_struct')
+        if struct is None:
+            struct = rawutil.Struct(cls.get_format(),
+                                    names=cls.get_keys())
+            struct.setbyteorder(cls.byteorder)
+            cls._struct = struct
         return struct
 
     def get_dict(self):
@@ -81,7 +104,8 @@ class DataType():
         :rtype: list
 
         """
-        return list(self.get_dict().values())
+        attributes = self.__dict__
+        return [attributes.get(key) for key in self.get_keys()]
 
     def get_data(self):
         """Return the packed data.
@@ -123,18 +147,30 @@ class DataType():
         :rtype: bool
 
         """
+        regex = self._charset_regex.get(pattern)
+        if regex is None:
+            # The patterns match a single character, so repeating the pattern
+            # checks the whole string in one pass
+            regex = re.compile(f'{pattern}*')
+            self._charset_regex[pattern] = regex
         string = bytes.decode()
-        matches = [re.search(pattern, char) for char in string]
-        return all(matches)
+        return regex.fullmatch(string) is not None
 
     def __str__(self):
         return str(self.get_dict())
 
+    @classmethod
+    def _get_repr_template(cls):
+        """Return the format string of the representation, cached on the class."""
+        template = cls.__dict__.get('_repr_template')
+        if template is None:
+            kwargs = ', '.join(f'{key}={{}}' for key in cls.get_keys())
+            template = f'{cls.__name__}({kwargs})'
+            cls._repr_template = template
+        return template
+
     def __repr__(self):
-        keys = self.get_keys()
-        values = map(str, self.get_values())
-        kwargs = ', '.join(map('='.join, zip(keys, values)))
-        return f"{self.__class__.__name__}({kwargs})"
+        return self._get_repr_template().format(*self.get_values())
 
 
 class Records(DataType):
@@ -244,7 +280,7 @@ class Position(DataType):
 
     @staticmethod
     def to_radians(semi):
-        return semi * (math.pi / 2 ** 31)
+        return semi * _SEMICIRCLES_TO_RADIANS
 
     def as_degrees(self):
         return DegreePosition(lat=self.to_degrees(self.lat),
@@ -288,11 +324,11 @@ class RadianPosition(DataType):
 
     @staticmethod
     def to_degrees(radians):
-        return radians * (180 / math.pi)
+        return radians * _RADIANS_TO_DEGREES
 
     @staticmethod
     def to_semicircles(radians):
-        return round(radians * (2 ** 31 / math.pi))
+        return round(radians * _RADIANS_TO_SEMICIRCLES)
 
     def as_degrees(self):
         return DegreePosition(lat=self.to_degrees(self.lat),
@@ -327,7 +363,7 @@ class DegreePosition(DataType):
 
     @staticmethod
     def to_radians(degrees):
-        return degrees * (math.pi / 180)
+        return degrees * _DEGREES_TO_RADIANS
 
     def as_semicircles(self):
         return Position(lat=self.to_semicircles(self.lat),
@@ -340,6 +376,7 @@ class DegreePosition(DataType):
 
 class Time(DataType):
     _epoch = datetime(1989, 12, 31, 0, 0, tzinfo=timezone.utc)  # 12:00 AM December 31, 1989 UTC
+    _epoch_timestamp = 631065600  # POSIX timestamp of the epoch
     _fields = [('time', 'I'),  # timestamp, invalid if 0xFFFFFFFF
                ]
 
@@ -361,12 +398,22 @@ class Time(DataType):
 
         """
         if self.is_valid():
-            delta = timedelta(seconds=self.time)
-            return self._epoch + delta
+            return datetime.fromtimestamp(self.time + self._epoch_timestamp, timezone.utc)
+
+    def get_timestamp(self):
+        """Return the POSIX timestamp of the time."""
+        if self.is_valid():
+            return self.time + self._epoch_timestamp
 
     def set_datetime(self, datetime):
-        delta = datetime - self._epoch
-        self.time = round(delta.total_seconds())
+        """Set the time from a datetime object.
+
+        A naive datetime object is assumed to represent UTC.
+
+        """
+        if datetime.tzinfo is None:
+            datetime = datetime.replace(tzinfo=timezone.utc)
+        self.time = round(datetime.timestamp()) - self._epoch_timestamp
 
     def is_valid(self):
         """Return whether the time is valid.
@@ -795,6 +842,9 @@ class Symbol(DataType):
         16401: 'sym_tacan',                       # TACAN symbol
         16402: 'sym_seaplane',                    # seaplane base
     }
+    # Reverse mapping of symbol names to values. Iterating in reverse order
+    # ensures that the first value wins if a name occurs more than once.
+    _smbl_value = {item: key for key, item in reversed(_smbl.items())}
 
     def __init__(self, smbl=18):
         self.smbl = smbl
@@ -812,7 +862,7 @@ class Symbol(DataType):
         If an invalid symbol is received, it will be substituted by a generic dot symbol.
 
         """
-        smbl_value = next((key for key, item in self._smbl.items() if item == symbol), 18)
+        smbl_value = self._smbl_value.get(symbol, 18)
         self.smbl = smbl_value
 
 
@@ -933,6 +983,7 @@ class D103(D100):
              1: 'dspl_smbl_none',  # display symbol by itself
              2: 'dspl_smbl_cmnt',  # display symbol with comment
              }
+    _dspl_value = {value: key for key, value in reversed(_dspl.items())}
 
     def __init__(self, smbl=0, dspl=0, **kwargs):
         super().__init__(**kwargs)
@@ -941,7 +992,7 @@ class D103(D100):
 
     def get_smbl(self):
         """Return the symbol value."""
-        return _smbl.get(self.smbl)
+        return self._smbl.get(self.smbl)
 
     def get_dspl(self):
         """Return the display option."""
@@ -953,7 +1004,7 @@ class D103(D100):
         If an invalid display value is received, the value will be 'dspl_smbl_name'.
 
         """
-        dspl_value = next((key for key, value in self._dspl.items() if value == dspl), 0)
+        dspl_value = self._dspl_value.get(dspl, 0)
         self.dspl = dspl_value
 
 
@@ -973,6 +1024,7 @@ class D104(D101):
              3: 'dspl_smbl_name',  # display symbol with waypoint name
              5: 'dspl_smbl_cmnt',  # display symbol with comment
              }
+    _dspl_value = {value: key for key, value in reversed(_dspl.items())}
 
     def __init__(self, dspl=0, **kwargs):
         super().__init__(**kwargs)
@@ -988,7 +1040,7 @@ class D104(D101):
         If an invalid display value is received, the value will be 'dspl_smbl_none'.
 
         """
-        dspl_value = next((key for key, value in self._dspl.items() if value == dspl), 0)
+        dspl_value = self._dspl_value.get(dspl, 0)
         self.dspl = dspl_value
 
 
@@ -1040,6 +1092,7 @@ class D107(D103):
               2: 'clr_green',          # green
               3: 'clr_blue',           # blue
               }
+    _color_value = {value: key for key, value in reversed(_color.items())}
 
     def __init__(self, dst=0, color=0, **kwargs):
         super().__init__(**kwargs)
@@ -1052,7 +1105,7 @@ class D107(D103):
 
     def set_color(self, color):
         """Set the color."""
-        color_value = next((key for key, value in self._color.items() if value == color), 0)
+        color_value = self._color_value.get(color, 0)
         self.set_color_value(color_value)
 
     def is_valid_dst(self):
@@ -1118,6 +1171,7 @@ class D108(D103):
               15:  'clr_white',
               255: 'clr_default_color'
               }
+    _color_value = {value: key for key, value in reversed(_color.items())}
 
     def __init__(self, wpt_class=0, color=255, attr=96, smbl=0, subclass=bytes((0, 0, 0, 0, 0, 0, 255, 255, 255, 255, 255, 255, 255, 255, 255, 255, 255, 255)), alt=1.0e25, dpth=1.0e25, dist=1.0e25, state=bytes(2), cc=bytes(2), cmnt=b'\x00', facility=b'\x00', city=b'\x00', addr=b'\x00', cross_road=b'\x00', **kwargs):
         super().__init__(**kwargs)
@@ -1156,7 +1210,7 @@ class D108(D103):
         'clr_default_color'.
 
         """
-        color_value = next((key for key, value in self._color.items() if value == color), 255)
+        color_value = self._color_value.get(color, 255)
         self.set_color_value(color_value)
 
     def get_symbol(self):
@@ -1233,6 +1287,7 @@ class D109(D108):
               15: 'clr_white',
               31: 'clr_default_color'
               }
+    _color_value = {value: key for key, value in reversed(_color.items())}
 
     def __init__(self, dtyp=1, dspl_color=0, attr=112, ete=4294967295, **kwargs):
         super().__init__(**kwargs)
@@ -1266,7 +1321,7 @@ class D109(D108):
         If an invalid color value is received, the value will be Black.
 
         """
-        color_value = next((key for key, value in self._color.items() if value == color), 255)
+        color_value = self._color_value.get(color, 255)
         self.set_color_value(color_value)
 
     def set_color_value(self, value):
@@ -1294,7 +1349,7 @@ class D109(D108):
         If an invalid display value is received, the value will be 'dspl_smbl_name'.
 
         """
-        dspl_value = next((key for key, value in self._dspl.items() if value == dspl), 0)
+        dspl_value = self._dspl_value.get(dspl, 0)
         self.set_dspl_value = dspl_value
 
     def set_dspl_value(self, value):
@@ -1364,10 +1419,12 @@ class D110(D109):
               15: 'clr_white',
               16: 'clr_transparent'
               }
+    _color_value = {value: key for key, value in reversed(_color.items())}
     _dspl = {0: 'dspl_smbl_name',
              1: 'dspl_smbl_only',
              2: 'dspl_smbl_comment',
              }
+    _dspl_value = {value: key for key, value in reversed(_dspl.items())}
 
     def __init__(self, attr=128, temp=1.0e25, time=4294967295,
                  wpt_cat=0, **kwargs):
@@ -1661,6 +1718,9 @@ class TrkPoint(DataType):
     def get_datetime(self):
         return Time(self.time).get_datetime()
 
+    def get_timestamp(self):
+        return Time(self.time).get_timestamp()
+
     def is_valid_time(self):
         """Return whether the time is valid.
 
@@ -2988,6 +3048,12 @@ class MPSRecord(DataType):
              'U': 'map_unlock_id',
              'V': 'map_set_id',
              }
+    _content = {'F': MapProduct,
+                'L': MapSegment,
+                'P': MapUnknown,
+                'U': MapUnlock,
+                'V': MapSet,
+                }
 
     def __init__(self, type, length, content):
         self.type = type
@@ -3004,22 +3070,11 @@ class MPSRecord(DataType):
         return self._type.get(chr(self.type))
 
     def get_content(self):
-        type = self.get_type()
-        if type == 'map_product_id':
-            mod_logger.log.debug(f"Record 'F': Product")
-            datatype = MapProduct()
-        elif type == 'map_segment_id':
-            mod_logger.log.debug(f"Record 'L': Map segment")
-            datatype = MapSegment()
-        elif type == 'map_unknown_id':
-            mod_logger.log.debug(f"Record 'P': Unknown")
-            datatype = MapUnknown()
-        elif type == 'map_unlock_id':
-            mod_logger.log.debug(f"Record 'U': Unlock")
-            datatype = MapUnlock()
-        elif type == 'map_set_id':
-            mod_logger.log.debug(f"Record 'V': Mapset")
-            datatype = MapSet()
+        """Return the record content as the datatype of the record type."""
+        record_type = chr(self.type)
+        content_class = self._content[record_type]
+        mod_logger.log.debug(f"Record '{record_type}': {content_class.__name__}")
+        datatype = content_class()
         datatype.unpack(self.content)
         return datatype
 
@@ -1,6 +1,7 @@
 """fit.py: Contains the FIT class which is used to encode fit files."""
 
 from datetime import datetime
+import logging
 from fit_tool.fit_file_builder import FitFileBuilder
 from fit_tool.profile.messages.activity_message import ActivityMessage
 from fit_tool.profile.messages.course_message import CourseMessage
@@ -11,10 +12,10 @@ from fit_tool.profile.messages.file_id_message import FileIdMessage
 from fit_tool.profile.messages.lap_message import LapMessage
 from fit_tool.profile.messages.record_message import RecordMessage
 from fit_tool.profile.messages.session_message import SessionMessage
-from fit_tool.profile.messages.user_profile_message import UserProfileMessage
 from fit_tool.profile.messages.workout_message import WorkoutMessage
 from fit_tool.profile.messages.workout_step_message import WorkoutStepMessage
 import fit_tool.profile.profile_type as profile_type
+from . import datatype as mod_datatype
 from . import logger as mod_logger
 
 
@@ -186,12 +187,16 @@ class FITActivity(FIT):
             message.total_timer_time = round(lap.total_time / 100)
             message.timestamp = message.start_time + message.total_elapsed_time
             message.total_distance = lap.total_dist
-            if lap.get_begin().is_valid():
-                message.begin_position_lat = lap.get_begin().as_degrees().lat
-                message.begin_position_long = lap.get_begin().as_degrees().lon
-            if lap.get_end().is_valid():
-                message.end_position_lat = lap.get_end().as_degrees().lat
-                message.end_position_long = lap.get_end().as_degrees().lon
+            begin = lap.get_begin()
+            if begin.is_valid():
+                begin_degrees = begin.as_degrees()
+                message.begin_position_lat = begin_degrees.lat
+                message.begin_position_long = begin_degrees.lon
+            end = lap.get_end()
+            if end.is_valid():
+                end_degrees = end.as_degrees()
+                message.end_position_lat = end_degrees.lat
+                message.end_position_long = end_degrees.lon
             if lap.is_valid_avg_heart_rate():
                 message.avg_heart_rate = lap.avg_heart_rate
             if lap.is_valid_max_heart_rate():
@@ -204,15 +209,19 @@ class FITActivity(FIT):
 
     def record_message(self, track):
         messages = []
+        log_datetime = mod_logger.log.isEnabledFor(logging.INFO)
+        to_degrees = mod_datatype.Position.to_degrees
         # Loop over track points excluding the track header
         for track_point in track[1:]:
-            if not track_point.is_valid_time() or not track_point.get_posn().is_valid():
+            posn = track_point.get_posn()
+            if not track_point.is_valid_time() or not posn.is_valid():
                 continue
             message = RecordMessage()
-            message.timestamp = round(track_point.get_datetime().astimezone().timestamp()) * 1000
-            mod_logger.log.info(f"Date and time: {track_point.get_datetime().astimezone().isoformat()}")
-            message.position_lat = track_point.get_posn().as_degrees().lat
-            message.position_long = track_point.get_posn().as_degrees().lon
+            message.timestamp = track_point.get_timestamp() * 1000
+            if log_datetime:
+                mod_logger.log.info(f"Date and time: {track_point.get_datetime().astimezone().isoformat()}")
+            message.position_lat = to_degrees(posn.lat)
+            message.position_long = to_degrees(posn.lon)
             mod_logger.log.info(f"Latitude: {message.position_lat}")
             mod_logger.log.info(f"Longitude: {message.position_long}")
             if track_point.is_valid_alt():
@@ -286,12 +295,16 @@ class FITCourse(FIT):
             message.message_index = lap.lap_index
             message.total_timer_time = lap.total_time
             message.total_distance = lap.total_dist
-            if lap.get_begin().is_valid():
-                message.begin_position_lat = lap.get_begin().as_degrees().lat
-                message.begin_position_long = lap.get_begin().as_degrees().lon
-            if lap.get_end().is_valid():
-                message.end_position_lat = lap.get_end().as_degrees().lat
-                message.end_position_long = lap.get_end().as_degrees().lon
+            begin = lap.get_begin()
+            if begin.is_valid():
+                begin_degrees = begin.as_degrees()
+                message.begin_position_lat = begin_degrees.lat
+                message.begin_position_long = begin_degrees.lon
+            end = lap.get_end()
+            if end.is_valid():
+                end_degrees = end.as_degrees()
+                message.end_position_lat = end_degrees.lat
+                message.end_position_long = end_degrees.lon
             if lap.is_valid_avg_heart_rate():
                 message.avg_heart_rate = lap.avg_heart_rate
             if lap.is_valid_max_heart_rate():
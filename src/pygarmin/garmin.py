@@ -57,7 +57,6 @@
 
 """
 
-from array import array
 from functools import cached_property
 import io
 from microbmp import MicroBMP
@@ -283,27 +282,31 @@ class Garmin():
     @cached_property
     def screenshot_transfer(self):
         """Screenshot Transfer Protocol."""
-        return ScreenshotTransfer(self)
+        return mod_protocol.ScreenshotTransfer(self)
 
     @cached_property
     def image_transfer(self):
         """Image Transfer Protocol."""
-        return ImageTransfer(self)
+        return mod_protocol.ImageTransfer(self)
 
     def _lookup_protocols(self, product_id, software_version):
         mod_logger.log.info("Look up protocols by Product ID and software version...")
         model = mod_capabilities.device_protocol_capabilities.get(product_id)
         if model is None:
             raise ValueError(f"Unknown Product ID: {product_id}")
-        for capabilities in model:
-            version = capabilities[0]
-            if software_version > version:
-                break
-            protocols = [protocol for protocol in capabilities[1:] if protocol]
-            protocols.append(("P000"))
-            protocols.append(("A000"))
-            protocols.append(("A600", "D600"))
-            protocols.append(("A700", "D700"))
+        # Models with a single entry are given as a flat tuple
+        if not isinstance(model[0], tuple):
+            model = (model,)
+        # The capabilities are sorted by descending software version, and the
+        # last entry applies to all versions, so take the first entry whose
+        # version the device's software version has reached
+        capabilities = next(capabilities for capabilities in model if software_version >= capabilities[0])
+        # Protocols without datatypes are given as strings instead of tuples
+        protocols = [(protocol,) if isinstance(protocol, str) else protocol for protocol in capabilities[1:] if protocol]
+        protocols.append(("P000",))
+        protocols.append(("A000",))
+        protocols.append(("A600", "D600"))
+        protocols.append(("A700", "D700"))
         return protocols
 
     def _get_protocols(self):
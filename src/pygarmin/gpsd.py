@@ -22,9 +22,10 @@ class TPV(Gpsd):
         self.eph = self.pvt.eph
         self.epv = self.pvt.epv
         self.geoid_sep = -self.pvt.msl_hght  # sign is opposite of garmin sign
-        self.lat = self.pvt.get_posn().as_degrees().lat
+        degree_posn = self.pvt.get_posn().as_degrees()
+        self.lat = degree_posn.lat
         self.leapseconds = self.pvt.leap_scnds
-        self.lon = self.pvt.get_posn().as_degrees().lon
+        self.lon = degree_posn.lon
         self.vel_d = -self.pvt.up  # sign is opposite of garmin sign
         self.vel_e = self.pvt.east
         self.vel_n = self.pvt.north
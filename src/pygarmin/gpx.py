@@ -1,6 +1,5 @@
 """gpx.py: Contains the GPX class which is used to encode gpx files."""
 
-from datetime import datetime, tzinfo
 import gpxpy
 import xml.etree.ElementTree as ET
 from . import datatype as mod_datatype
@@ -319,6 +318,7 @@ class GPXWaypoints(GPX):
 
     def waypoints_to_gpx(self, waypoints):
         gpx = gpxpy.gpx.GPX()
+        to_degrees = mod_datatype.Position.to_degrees
         gpx.name = 'Waypoints'
         gpx.description = 'Waypoints'
         gpx.creator = self.creator
@@ -326,30 +326,27 @@ class GPXWaypoints(GPX):
         nsmap = { gpxx: 'https://www8.garmin.com/xmlschemas/GpxExtensions/v3/GpxExtensionsv3.xsd' }
         gpx.nsmap = nsmap
         for point in waypoints:
-            if isinstance(point, mod_datatype.Wpt) and point.get_posn().is_valid():
+            if not isinstance(point, mod_datatype.Wpt):
+                continue
+            posn = point.get_posn()
+            if posn.is_valid():
                 # Possible fields: ('posn', 'color', 'lnk_ident', 'city',
                 # 'attr', 'facility', 'dspl_color', 'dst', 'dpth', 'cc', 'cmnt',
                 # 'wpt_cat', 'alt', 'state', 'time', 'unused', 'cross_road',
                 # 'addr', 'dtyp', 'dspl', 'temp', 'dist', 'subclass', 'ete',
                 # 'wpt_class', 'ident', 'smbl', 'wpt_ident')
-                latitude = point.get_posn().as_degrees().lat
-                longitude = point.get_posn().as_degrees().lon
+                fields = point.get_dict()
+                latitude = to_degrees(posn.lat)
+                longitude = to_degrees(posn.lon)
                 name = point.ident.decode(encoding='latin_1')
                 comment = point.cmnt.decode(encoding='latin_1')
-                if point.get_dict().get('alt') is not None and point.is_valid_alt():
+                if fields.get('alt') is not None and point.is_valid_alt():
                     elevation = point.alt
                 else:
                     elevation = None
-                if point.get_dict().get('time') is not None and point.is_valid_time():
-                    time = point.get_datetime()
-                else:
-                    time = None
-                if point.get_dict().get('smbl') is not None:
+                if fields.get('smbl') is not None:
                     smbl = point.get_smbl()
-                    if self._symbol.get(smbl) is not None:
-                        symbol = self._symbol.get(smbl)
-                    else:
-                        symbol = smbl
+                    symbol = self._symbol.get(smbl, smbl)
                 else:
                     symbol = None
                 gpx_point = gpxpy.gpx.GPXWaypoint(latitude=latitude,
@@ -358,25 +355,6 @@ class GPXWaypoints(GPX):
                                                   name=name,
                                                   comment=comment,
                                                   symbol=symbol)
-                waypoint_extension = ET.Element(f'{{{gpxx}}}WaypointExtension')
-                # The 'dst' (D101, D102, D104, D107) and 'dist' (D108, D109,
-                # D100) fields both contain the proximity distance in meters
-                if point.get_dict().get('dst') is not None and point.is_valid_dst():
-                    proximity = ET.SubElement(waypoint_extension, f'{{{gpxx}}}Proximity')
-                    proximity.text = str(point.dst)
-                if point.get_dict().get('dist') is not None  and point.is_valid_dist():
-                    proximity = ET.SubElement(waypoint_extension, f'{{{gpxx}}}Proximity')
-                    proximity.text = str(point.dist)
-                if point.get_dict().get('temp') is not None and point.is_valid_temp():
-                    temperature = ET.SubElement(waypoint_extension, f'{{{gpxx}}}Temperature')
-                    temperature.text = str(point.temp)
-                if point.get_dict().get('dpth') and point.is_valid_dpth():
-                    depth = ET.SubElement(waypoint_extension, f'{{{gpxx}}}Depth')
-                    depth.text = str(point.dpth)
-                if point.get_dict().get('dspl'):
-                    display_mode = ET.SubElement(waypoint_extension, f'{{{gpxx}}}DisplayMode')
-                    dspl = point.get_dspl()
-                    display_mode.text = self._display_mode.get(dspl)
                 gpx.waypoints.append(gpx_point)
         return gpx
 
@@ -388,51 +366,40 @@ class GPXRoutes(GPX):
 
     def routes_to_gpx(self, routes):
         gpx = gpxpy.gpx.GPX()
+        to_degrees = mod_datatype.Position.to_degrees
         gpx.name = 'Routes'
         gpx.description = 'Routes'
         gpx.creator = self.creator
         gpxx = 'gpxx'
         nsmap = { gpxx: 'https://www8.garmin.com/xmlschemas/GpxExtensions/v3/GpxExtensionsv3.xsd' }
         gpx.nsmap = nsmap
+        gpx_route = None
         for route in routes:
             for point in route:
-                if isinstance(point, mod_datatype.RteHdr):
-                    # Possible fields: ('nmbr', 'cmnt', 'ident')
-                    gpx_route = gpxpy.gpx.GPXRoute()
-                    number = point.get_dict().get('nmbr')
-                    name = point.get_dict().get('ident')
-                    comment = point.get_dict().get('cmnt')
-                    gpx_route.number = number
-                    if name is not None:
-                        gpx_route.name = name.decode(encoding='latin_1')
-                    if comment is not None:
-                        gpx_route.comment = comment.decode(encoding='latin_1')
-                    gpx.routes.append(gpx_route)
-                elif isinstance(point, mod_datatype.Wpt):
+                fields = point.get_dict()
+                if isinstance(point, mod_datatype.Wpt):
                     # Possible fields: ('dist', 'state', 'wpt_ident', 'subclass',
                     # 'dst', 'facility', 'dtyp', 'dspl_color', 'cross_road',
                     # 'wpt_cat', 'attr', 'color', 'smbl', 'addr', 'ete', 'alt',
                     # 'wpt_class', 'lnk_ident', 'dpth', 'city', 'posn', 'dspl',
                     # 'ident', 'unused', 'cmnt', 'temp', 'cc', 'time')
-                    if point.get_posn().is_valid():
-                        latitude = point.get_posn().as_degrees().lat
-                        longitude = point.get_posn().as_degrees().lon
-                        if point.get_dict().get('alt') is not None and point.is_valid_alt():
+                    posn = point.get_posn()
+                    if posn.is_valid():
+                        latitude = to_degrees(posn.lat)
+                        longitude = to_degrees(posn.lon)
+                        if fields.get('alt') is not None and point.is_valid_alt():
                             elevation = point.alt
                         else:
                             elevation = None
                         name = point.ident.decode(encoding='latin_1')
                         comment = point.cmnt.decode(encoding='latin_1')
-                        if point.get_dict().get('time') is not None and point.is_valid_time():
+                        if fields.get('time') is not None and point.is_valid_time():
                             time = point.get_datetime()
                         else:
                             time = None
-                        if point.get_dict().get('smbl') is not None:
+                        if fields.get('smbl') is not None:
                             smbl = point.get_smbl()
-                            if self._symbol.get(smbl) is not None:
-                                symbol = self._symbol.get(smbl)
-                            else:
-                                symbol = smbl
+                            symbol = self._symbol.get(smbl, smbl)
                         else:
                             symbol = None
                         gpx_point = gpxpy.gpx.GPXRoutePoint(latitude=latitude,
@@ -443,7 +410,7 @@ class GPXRoutes(GPX):
                                                             time=time,
                                                             symbol=symbol)
                         route_point_extension = ET.Element(f'{{{gpxx}}}RoutePointExtension')
-                        if point.get_dict().get('wpt_class') is not None:
+                        if fields.get('wpt_class') is not None:
                             wpt_class = point.get_wpt_class()
                             if wpt_class != 0:  # Non-user waypoint
                                 subclass = ET.SubElement(route_point_extension, f'{{{gpxx}}}Subclass')
@@ -453,8 +420,18 @@ class GPXRoutes(GPX):
                                 subclass.text = subclass_hex
                         gpx_point.extensions.append(route_point_extension)
                         gpx_route.points.append(gpx_point)
-                elif isinstance(point, mod_datatype.RteLink):
-                    pass
+                elif isinstance(point, mod_datatype.RteHdr):
+                    # Possible fields: ('nmbr', 'cmnt', 'ident')
+                    gpx_route = gpxpy.gpx.GPXRoute()
+                    number = fields.get('nmbr')
+                    name = fields.get('ident')
+                    comment = fields.get('cmnt')
+                    gpx_route.number = number
+                    if name is not None:
+                        gpx_route.name = name.decode(encoding='latin_1')
+                    if comment is not None:
+                        gpx_route.comment = comment.decode(encoding='latin_1')
+                    gpx.routes.append(gpx_route)
         return gpx
 
 
@@ -465,6 +442,7 @@ class GPXTracks(GPX):
 
     def tracks_to_gpx(self, tracks):
         gpx = gpxpy.gpx.GPX()
+        to_degrees = mod_datatype.Position.to_degrees
         gpx.name = 'Tracks'
         gpx.description = 'Tracks'
         gpx.creator = self.creator
@@ -473,59 +451,67 @@ class GPXTracks(GPX):
         nsmap = { gpxx: 'https://www8.garmin.com/xmlschemas/GpxExtensions/v3/GpxExtensionsv3.xsd',
                   gpxtpx: 'http://www8.garmin.com/xmlschemas/TrackPointExtensionv2.xsd' }
         gpx.nsmap = nsmap
+        track_point_extension_tag = f'{{{gpxtpx}}}TrackPointExtension'
+        hr_tag = f'{{{gpxtpx}}}hr'
+        depth_tag = f'{{{gpxtpx}}}depth'
+        cad_tag = f'{{{gpxtpx}}}cad'
+        atemp_tag = f'{{{gpxtpx}}}atemp'
         for track in tracks:
             for point in track:
-                if isinstance(point, mod_datatype.TrkHdr):
-                    # Possible fields: ('color', 'trk_ident', 'index', 'dspl')
-                    gpx_track = gpxpy.gpx.GPXTrack()
-                    identifier = point.get_dict().get('trk_ident')
-                    index = point.get_dict().get('index')
-                    name = identifier if identifier else str(index).encode()
-                    gpx.tracks.append(gpx_track)
-                    gpx_track.name = name.decode(encoding='latin_1')
-                    track_extension = ET.Element(f'{{{gpxx}}}TrackExtension')
-                    if point.get_dict().get('color') is not None or point.get_dict().get('dspl_color') is not None:
-                        color = point.get_color()
-                        if self._display_color.get(color) is not None:
-                            display_color = ET.SubElement(track_extension, f'{{{gpxx}}}DisplayColor')
-                            display_color.text = self._display_color.get(color)
-                    gpx_track.extensions.append(track_extension)
-                elif isinstance(point, mod_datatype.TrkPoint):
+                fields = point.get_dict()
+                if isinstance(point, mod_datatype.TrkPoint):
                     # Possible fields: ('new_trk', 'alt', 'heart_rate', 'sensor',
                     # 'dpth', 'cadence', 'posn', 'temp', 'time', 'distance')
                     if len(gpx.tracks) == 0:
                         gpx_track = gpxpy.gpx.GPXTrack()
                         gpx.tracks.append(gpx_track)
-                    if point.get_dict().get('new_trk') or len(gpx_track.segments) == 0:
+                    if fields.get('new_trk') or len(gpx_track.segments) == 0:
                         gpx_segment = gpxpy.gpx.GPXTrackSegment()
                         gpx_track.segments.append(gpx_segment)
-                    if point.get_posn().is_valid():
-                        latitude = point.get_posn().as_degrees().lat
-                        longitude = point.get_posn().as_degrees().lon
+                    posn = point.get_posn()
+                    if posn.is_valid():
+                        latitude = to_degrees(posn.lat)
+                        longitude = to_degrees(posn.lon)
                         time = point.get_datetime()
                         if point.is_valid_alt():
-                            elevation = point.get_dict().get('alt')
+                            elevation = fields.get('alt')
                         else:
                             elevation = None
                         gpx_point = gpxpy.gpx.GPXTrackPoint(latitude=latitude,
                                                             longitude=longitude,
                                                             elevation=elevation,
                                                             time=time)
-                        track_point_extension = ET.Element(f'{{{gpxtpx}}}TrackPointExtension')
-                        if point.get_dict().get('heart_rate') is not None:
-                            hr = ET.SubElement(track_point_extension, f'{{{gpxtpx}}}hr')
+                        track_point_extension = ET.Element(track_point_extension_tag)
+                        if fields.get('heart_rate') is not None:
+                            hr = ET.SubElement(track_point_extension, hr_tag)
                             hr.text = str(point.heart_rate)
-                        if point.get_dict().get('dpth') is not None and point.is_valid_dpth():
-                            depth = ET.SubElement(track_point_extension, f'{{{gpxtpx}}}depth')
+                        if fields.get('dpth') is not None and point.is_valid_dpth():
+                            depth = ET.SubElement(track_point_extension, depth_tag)
                             depth.text = str(point.dpth)
-                        if point.get_dict().get('cadence') is not None:
-                            cad = ET.SubElement(track_point_extension, f'{{{gpxtpx}}}cad')
+                        if fields.get('cadence') is not None:
+                            cad = ET.SubElement(track_point_extension, cad_tag)
                             cad.text = str(point.cadence)
-                        if point.get_dict().get('temp') is not None and point.is_valid_temp():
-                            atemp = ET.SubElement(track_point_extension, f'{{{gpxtpx}}}atemp')
+                        if fields.get('temp') is not None and point.is_valid_temp():
+                            atemp = ET.SubElement(track_point_extension, atemp_tag)
                             atemp.text = str(point.temp)
                         gpx_point.extensions.append(track_point_extension)
                         gpx_segment.points.append(gpx_point)
+                elif isinstance(point, mod_datatype.TrkHdr):
+                    # Possible fields: ('color', 'trk_ident', 'index', 'dspl')
+                    gpx_track = gpxpy.gpx.GPXTrack()
+                    identifier = fields.get('trk_ident')
+                    index = fields.get('index')
+                    name = identifier if identifier else str(index).encode()
+                    gpx.tracks.append(gpx_track)
+                    gpx_track.name = name.decode(encoding='latin_1')
+                    track_extension = ET.Element(f'{{{gpxx}}}TrackExtension')
+                    if fields.get('color') is not None or fields.get('dspl_color') is not None:
+                        color = point.get_color()
+                        color_name = self._display_color.get(color)
+                        if color_name is not None:
+                            display_color = ET.SubElement(track_extension, f'{{{gpxx}}}DisplayColor')
+                            display_color.text = color_name
+                    gpx_track.extensions.append(track_extension)
         return gpx
 
 
@@ -842,15 +828,14 @@ class GarminWaypoints(Garmin):
 
     def gpx_to_waypoints(self, xml_or_file, datatypes):
         gpx = gpxpy.parse(xml_or_file)
+        to_semicircles = mod_datatype.DegreePosition.to_semicircles
         waypoints = []
         if gpx.waypoints:
             for point in gpx.waypoints:
                 wpt = datatypes[0]()
                 mod_logger.log.info(f"Adding waypoint {point.name}")
                 wpt.ident = str.encode(point.name)
-                degree_posn = mod_datatype.DegreePosition(point.latitude, point.longitude)
-                posn = degree_posn.as_semicircles()
-                wpt.posn = (posn.lat, posn.lon)
+                wpt.posn = (to_semicircles(point.latitude), to_semicircles(point.longitude))
                 if point.has_elevation() and 'alt' in wpt.get_keys():
                     wpt.alt = point.elevation
                 extension = next((extension for extension in point.extensions if extension.tag.endswith('WayPointExtension')), None)
@@ -895,11 +880,15 @@ class GarminRoutes(Garmin):
 
     def gpx_to_routes(self, xml_or_file, datatypes):
         gpx = gpxpy.parse(xml_or_file)
+        to_semicircles = mod_datatype.DegreePosition.to_semicircles
         routes = []
+        has_rte_hdr = issubclass(datatypes[0], mod_datatype.RteHdr)
+        has_rte_link = any(issubclass(datatype, mod_datatype.RteLink) for datatype in datatypes)
         if gpx.routes:
             mod_logger.log.info(f"Converting {len(gpx.routes)} route(s)")
             for route in gpx.routes:
-                if issubclass(datatypes[0], mod_datatype.RteHdr):
+                color = None
+                if has_rte_hdr:
                     rte_hdr = datatypes[0]()
                     point_type = datatypes[1]
                     mod_logger.log.info(f"Adding route {route.name}")
@@ -920,9 +909,7 @@ class GarminRoutes(Garmin):
                 for idx, point in enumerate(route.points):
                     mod_logger.log.info(f"Adding waypoint {idx+1}")
                     rte_wpt = point_type()
-                    degree_posn = mod_datatype.DegreePosition(point.latitude, point.longitude)
-                    posn = degree_posn.as_semicircles()
-                    rte_wpt.posn = (posn.lat, posn.lon)
+                    rte_wpt.posn = (to_semicircles(point.latitude), to_semicircles(point.longitude))
                     if point.has_elevation():
                         rte_wpt.alt = point.elevation
                     if point.time is not None:
@@ -934,7 +921,7 @@ class GarminRoutes(Garmin):
                     rte_wpt.ident = str.encode(point.name)
                     if point.comment is not None:
                         rte_wpt.cmnt = str.encode(point.comment)
-                    if 'color' in vars():
+                    if color is not None:
                         rte_wpt.set_color(color)
                     if point.symbol is not None:
                         symbol = self._symbol.get(point.symbol)
@@ -950,7 +937,7 @@ class GarminRoutes(Garmin):
                     points.append(rte_wpt)
                 # The A201 route transfer protocol adds an undocumented proprietary
                 # waypoint link between waypoints
-                if any([issubclass(datatype, mod_datatype.RteLink) for datatype in datatypes]):
+                if has_rte_link:
                     rte_link = datatypes[2]()
                     mod_logger.log.info(f"Linking waypoints")
                     points = list(self.join(points, rte_link))
@@ -958,8 +945,7 @@ class GarminRoutes(Garmin):
         elif gpx.tracks:
             mod_logger.log.info(f"Converting {len(gpx.tracks)} route(s)")
             for track in gpx.tracks:
-                if issubclass(datatypes[0], mod_datatype.RteHdr):
-                    mod_logger.log.info(f"{datatypes[0]}, {mod_datatype.RteHdr}")
+                if has_rte_hdr:
                     rte_hdr = datatypes[0]()
                     point_type = datatypes[1]
                     mod_logger.log.info(f"Adding route {track.name}")
@@ -981,9 +967,7 @@ class GarminRoutes(Garmin):
                     for idx, point in enumerate(segment.points):
                         mod_logger.log.info(f"Adding waypoint {idx+1}")
                         rte_wpt = point_type()
-                        degree_posn = mod_datatype.DegreePosition(point.latitude, point.longitude)
-                        posn = degree_posn.as_semicircles()
-                        rte_wpt.posn = (posn.lat, posn.lon)
+                        rte_wpt.posn = (to_semicircles(point.latitude), to_semicircles(point.longitude))
                         if point.has_elevation():
                             rte_wpt.alt = point.elevation
                         if point.time is not None:
@@ -1003,7 +987,7 @@ class GarminRoutes(Garmin):
                         points.append(rte_wpt)
                 # The A201 route transfer protocol adds an undocumented proprietary
                 # waypoint link between waypoints
-                if any([issubclass(datatype, mod_datatype.RteLink) for datatype in datatypes]):
+                if has_rte_link:
                     rte_link = datatypes[2]()
                     mod_logger.log.info(f"Linking waypoints")
                     points = list(self.join(points, rte_link))
@@ -1018,10 +1002,12 @@ class GarminTracks(Garmin):
 
     def gpx_to_tracks(self, xml_or_file, datatypes):
         gpx = gpxpy.parse(xml_or_file)
+        to_semicircles = mod_datatype.DegreePosition.to_semicircles
         tracks = []
+        has_trk_hdr = issubclass(datatypes[0], mod_datatype.TrkHdr)
         if gpx.tracks:
             for idx, track in enumerate(gpx.tracks):
-                if issubclass(datatypes[0], mod_datatype.TrkHdr):
+                if has_trk_hdr:
                     trk_hdr = datatypes[0]()
                     point_type = datatypes[1]
                     if track.name:
@@ -1036,6 +1022,7 @@ class GarminTracks(Garmin):
                 else:
                     point_type = datatypes[0]
                     tracks.append([])
+                color = None
                 extension = next((extension for extension in track.extensions if extension.tag.endswith('TrackExtension')),None)
                 if extension:
                     uri = extension.tag.rstrip('TrackExtension')
@@ -1047,9 +1034,7 @@ class GarminTracks(Garmin):
                     for idx, point in enumerate(segment.points):
                         mod_logger.log.info(f"Adding track point {idx}")
                         trk_point = point_type()
-                        degree_posn = mod_datatype.DegreePosition(point.latitude, point.longitude)
-                        posn = degree_posn.as_semicircles()
-                        trk_point.posn = (posn.lat, posn.lon)
+                        trk_point.posn = (to_semicircles(point.latitude), to_semicircles(point.longitude))
                         if point.has_elevation():
                             trk_point.alt = point.elevation
                         if point.time is not None:
@@ -1057,7 +1042,7 @@ class GarminTracks(Garmin):
                             point_time.set_datetime(point.time)
                             if point_time.is_valid():
                                 trk_point.time = point_time.time
-                        if 'color' in vars():
+                        if color is not None:
                             trk_point.set_color(color)
                         extension = next((extension for extension in point.extensions if extension.tag.endswith('TrackPointExtension')), None)
                         if extension is not None:
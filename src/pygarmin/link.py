@@ -1,5 +1,7 @@
 from functools import cached_property
+import logging
 import serial
+import struct
 import usb
 from . import error as mod_error
 from . import logger as mod_logger
@@ -32,6 +34,10 @@ class SerialLink(P000):
     etx = 3  # End of Text
     pid_ack_byte = 6  # Acknowledge
     pid_nak_byte = 21  # Negative Acknowledge
+    # Byte strings for DLE stuffing and the packet trailer
+    _dle_bytes = bytes([dle])
+    _escaped_dle_bytes = bytes([dle, dle])
+    _trailer_bytes = bytes([dle, etx])
 
     def __init__(self, port):
         self.port = port
@@ -66,11 +72,11 @@ class SerialLink(P000):
         extra DLE is not included in the size or checksum calculation. This
         procedure allows the DLE character to be used to delimit the boundaries
         of a packet."""
-        return data.replace(bytes([self.dle]), bytes([self.dle, self.dle]))
+        return data.replace(self._dle_bytes, self._escaped_dle_bytes)
 
     def unescape(self, data):
         """Unescape any DLE characters, aka "DLE unstuffing"."""
-        return data.replace(bytes([self.dle, self.dle]), bytes([self.dle]))
+        return data.replace(self._escaped_dle_bytes, self._dle_bytes)
 
     def checksum(self, data):
         """The checksum value contains the two's complement of the modulo 256 sum of
@@ -79,12 +85,7 @@ class SerialLink(P000):
         it.
 
         """
-        sum = 0
-        for i in data:
-            sum = sum + i
-            sum %= 256
-            checksum = (256 - sum) % 256
-        return checksum
+        return -sum(data) % 256
 
     def unpack(self, buffer):
         """All data is transferred in byte-oriented packets. A packet contains a
@@ -147,56 +148,81 @@ class SerialLink(P000):
             raise mod_error.ProtocolError(f"Invalid data type: should be 'bytes' or 'int', but is {datatype}")
         size = len(data)
         mod_logger.log.debug(f"Packet data size: {size}")
-        checksum = self.checksum(bytes([pid])
-                                 + bytes([size])
-                                 + data)
+        checksum = self.checksum(bytes([pid, size]) + data)
         mod_logger.log.debug(f"Packet data checksum: {checksum}")
-        packet = bytes([self.dle]) \
-            + bytes([pid]) \
-            + self.escape(bytes([size])) \
-            + self.escape(data) \
-            + self.escape(bytes([checksum])) \
-            + bytes([self.dle]) \
-            + bytes([self.etx])
+        # The size, data, and checksum fields are escaped in one pass
+        packet = bytes([self.dle, pid]) \
+            + self.escape(bytes([size]) + data + bytes([checksum])) \
+            + self._trailer_bytes
         return packet
 
-    def read(self):
-        """Read one packet from the buffer."""
-        dle = bytes([self.dle])
-        etx = bytes([self.etx])
+    def _read(self, size):
+        """Read exactly ``size`` bytes from the serial port."""
+        try:
+            data = self.ser.read(size)
+        except serial.SerialException as e:
+            raise mod_error.LinkError(e.strerror)
+        if not data:
+            raise mod_error.LinkError("Reading packet timed out")
+        elif len(data) != size:
+            raise mod_error.LinkError("Invalid packet: unexpected end")
+        return data
+
+    def _read_escaped(self, size):
+        """Read the DLE stuffed bytes of ``size`` bytes of unescaped data.
+
+        Every DLE in the escaped data is followed by a second DLE. After reading
+        the expected number of bytes, only the missing stuffed DLEs have to be
+        read in addition.
+
+        """
         buffer = bytearray()
-        packet = bytearray()
+        remaining = size
+        while remaining > 0:
+            buffer += self._read(remaining)
+            dle_count = buffer.count(self._dle_bytes)
+            # A trailing unpaired DLE still lacks its stuffed DLE
+            remaining = size - len(buffer) + dle_count // 2 + dle_count % 2
+        return buffer
 
-        while True:
-            # Buffer two bytes, because all DLEs occur in pairs except at packet
-            # boundaries
-            try:
-                buffer += self.ser.read(2-len(buffer))
-            except serial.SerialException as e:
-                raise mod_error.LinkError(e.strerror)
-            if not buffer:
-                raise mod_error.LinkError("Reading packet timed out")
-            elif len(buffer) != 2:
-                raise mod_error.LinkError("Invalid packet: unexpected end")
-            elif len(packet) == 0:
-                # Packet header
-                if buffer.startswith(dle):
-                    packet += bytes([buffer.pop(0)])
-                else:
-                    raise mod_error.LinkError("Invalid packet: doesn't start with DLE character")
-            elif buffer.startswith(dle):
-                # Escape DLE
-                if buffer == dle + dle:
-                    packet += buffer
+    def _skip_packet(self, buffer):
+        """Discard the bytes up to and including the next DLE/ETX trailer.
+
+        ``buffer`` holds the last bytes that were read from the packet.
+
+        """
+        buffer = bytearray(buffer)
+        try:
+            while not buffer.endswith(self._trailer_bytes):
+                if buffer.endswith(self._escaped_dle_bytes):
                     buffer.clear()
-                    # Packet trailer
-                elif buffer == dle + etx:
-                    packet += buffer
-                    break
-                else:
-                    raise mod_error.LinkError("Invalid packet: doesn't end with DLE and ETX character")
-            else:
-                packet += bytes([buffer.pop(0)])
+                buffer += self._read(1)
+        except mod_error.LinkError:
+            pass
+
+    def read(self):
+        """Read one packet from the buffer.
+
+        The size field in the header determines the number of bytes that
+        follow it.
+
+        """
+        packet = bytearray(self._read(3))
+        if packet[0] != self.dle:
+            raise mod_error.LinkError("Invalid packet: doesn't start with DLE character")
+        size = packet[2]
+        if size == self.dle:
+            # Read the stuffed DLE of the size field
+            packet += self._read(1)
+        # The size field is followed by the packet data and the checksum
+        packet += self._read_escaped(size + 1)
+        trailer = self._read(2)
+        if trailer != self._trailer_bytes:
+            # The size field may be corrupted, so resynchronize on the trailer
+            # to start the next read at a packet boundary
+            self._skip_packet(trailer)
+            raise mod_error.LinkError("Invalid packet: doesn't end with DLE and ETX character")
+        packet += trailer
         return bytes(packet)
 
     def write(self, buffer):
@@ -210,7 +236,8 @@ class SerialLink(P000):
         while retries <= self.max_retries:
             try:
                 buffer = self.read()
-                mod_logger.log.debug(f"> {bytes.hex(buffer, sep=' ')}")
+                if mod_logger.log.isEnabledFor(logging.DEBUG):
+                    mod_logger.log.debug(f"> {bytes.hex(buffer, sep=' ')}")
                 packet = self.unpack(buffer)
                 if acknowledge:
                     self.send_ack(packet['id'])
@@ -226,7 +253,8 @@ class SerialLink(P000):
     def send_packet(self, pid, data, acknowledge=True):
         """Send a packet."""
         buffer = self.pack(pid, data)
-        mod_logger.log.debug(f"< {bytes.hex(buffer, sep=' ')}")
+        if mod_logger.log.isEnabledFor(logging.DEBUG):
+            mod_logger.log.debug(f"< {bytes.hex(buffer, sep=' ')}")
         retries = 0
         while retries <= self.max_retries:
             try:
@@ -300,6 +328,9 @@ class USBLink(P000):
     """
     idVendor = 2334  # 0x091e
     max_buffer_size = 4096
+    # Packet header: packet type, 3 reserved bytes, packet ID, 2 reserved
+    # bytes, and data size
+    _header = struct.Struct('<B3xH2xI')
 
     # Packet Types
     USB_Protocol_Layer = 0  # 0x00
@@ -429,14 +460,12 @@ class USBLink(P000):
         """Unpack a raw USB packet.
 
         """
-        # packet_type = buffer[0]  # unused
-        # reserved_1 = buffer[1:4]  # unused
-        id = buffer[4:6]
-        # reserved_2 = buffer[6:8]  # unused
-        size = buffer[8:12]
-        data = buffer[12:]
-        id = int.from_bytes(id, byteorder='little')
-        size = int.from_bytes(size, byteorder='little')
+        header_size = self._header.size
+        if len(buffer) < header_size:
+            raise mod_error.LinkError("Invalid packet: incomplete header")
+        # The packet type is unused
+        packet_type, id, size = self._header.unpack_from(buffer)
+        data = buffer[header_size:]
         if size != len(data):
             raise mod_error.ProtocolError("Invalid packet: wrong size of packet data")
         return {'id': id, 'data': data}
@@ -473,12 +502,7 @@ class USBLink(P000):
             raise mod_error.ProtocolError(f"Invalid data type: should be 'bytes' or 'int', but is {datatype}")
         size = len(data)
         mod_logger.log.debug(f"Data size: {size}")
-        packet = bytes([layer]) \
-            + bytes([0]) * 3 \
-            + pid.to_bytes(2, byteorder='little') \
-            + bytes([0]) * 2 \
-            + size.to_bytes(4, byteorder='little') \
-            + data
+        packet = self._header.pack(layer, pid, size) + data
         return packet
 
     def read(self):
@@ -508,7 +532,8 @@ class USBLink(P000):
         while retries <= self.max_retries:
             try:
                 buffer = self.read()
-                mod_logger.log.debug(f"> {bytes.hex(buffer, sep=' ')}")
+                if mod_logger.log.isEnabledFor(logging.DEBUG):
+                    mod_logger.log.debug(f"> {bytes.hex(buffer, sep=' ')}")
                 packet = self.unpack(buffer)
                 break
             except mod_error.LinkError as e:
@@ -521,7 +546,8 @@ class USBLink(P000):
     def send_packet(self, pid, data):
         """Send a packet."""
         buffer = self.pack(self.Application_Layer, pid, data)
-        mod_logger.log.debug(f"< {bytes.hex(buffer, sep=' ')}")
+        if mod_logger.log.isEnabledFor(logging.DEBUG):
+            mod_logger.log.debug(f"< {bytes.hex(buffer, sep=' ')}")
         retries = 0
         while retries <= self.max_retries:
             try:
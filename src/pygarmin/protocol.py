@@ -1,4 +1,5 @@
 from functools import cached_property
+import logging
 import math
 from microbmp import MicroBMP
 import os
@@ -469,46 +470,55 @@ class TransferProtocol:
         self.datatypes = datatypes
 
     def get_data(self, cmd, *pids, callback=None):
-        self.gps.link.send_packet(self.gps.link.pid_command_data, cmd)
-        packet = self.gps.link.expect_packet(self.gps.link.pid_records)
+        link = self.gps.link
+        link.send_packet(link.pid_command_data, cmd)
+        packet = link.expect_packet(link.pid_records)
         datatype = mod_datatype.Records()
         datatype.unpack(packet['data'])
         packet_count = datatype.records
         mod_logger.log.info(f"{type(self).__name__}: Expecting {packet_count} records")
         result = []
+        datatypes = self.datatypes
+        log_records = mod_logger.log.isEnabledFor(logging.INFO)
         for idx in range(packet_count):
-            packet = self.gps.link.read_packet()
+            packet = link.read_packet()
             pid = packet['id']
             data = packet['data']
+            # Check the packet ID before the data is unpacked
+            if pid not in pids:
+                raise mod_error.ProtocolError(f"Expected one of {*pids,}, got {pid}")
             i = pids.index(pid)
-            datatype = self.datatypes[i]()
+            datatype = datatypes[i]()
             mod_logger.log.info(f"Datatype {type(datatype).__name__}")
             datatype.unpack(data)
-            mod_logger.log.info(f"{str(datatype)}")
-            if pid in pids:
-                result.append(datatype)
-            else:
-                raise mod_error.ProtocolError(f"Expected one of {*pids,}, got {pid}")
+            if log_records:
+                mod_logger.log.info(f"{str(datatype)}")
+            result.append(datatype)
             if callback:
                 callback(datatype, idx+1, packet_count)
-        self.gps.link.expect_packet(self.gps.link.pid_xfer_cmplt)
+        link.expect_packet(link.pid_xfer_cmplt)
         return result
 
     def put_data(self, cmd, packets, callback=None):
+        link = self.gps.link
         packet_count = len(packets)
         mod_logger.log.info(f"{type(self).__name__}: Sending {packet_count} records")
-        self.gps.link.send_packet(self.gps.link.pid_records, packet_count)
+        link.send_packet(link.pid_records, packet_count)
+        log_records = mod_logger.log.isEnabledFor(logging.INFO)
+        log_packets = mod_logger.log.isEnabledFor(logging.DEBUG)
         for idx, packet in enumerate(packets):
             pid = packet['id']
             datatype = packet['data']
             datatype.pack()
-            mod_logger.log.info(f"{str(datatype)}")
+            if log_records:
+                mod_logger.log.info(f"{str(datatype)}")
             data = datatype.get_data()
-            mod_logger.log.debug(f"> packet {pid:3}: {bytes.hex(data, sep=' ')}")
-            self.gps.link.send_packet(pid, data)
+            if log_packets:
+                mod_logger.log.debug(f"> packet {pid:3}: {bytes.hex(data, sep=' ')}")
+            link.send_packet(pid, data)
             if callback:
                 callback(datatype, idx+1, packet_count)
-        self.gps.link.send_packet(self.gps.link.pid_xfer_cmplt, cmd)
+        link.send_packet(link.pid_xfer_cmplt, cmd)
 
 
 class A100(TransferProtocol):
@@ -625,28 +635,29 @@ class A200(TransferProtocol):
 
     def put_data(self, routes, callback=None):
         packets = []
+        pid_rte_hdr = self.gps.link.pid_rte_hdr
+        pid_rte_wpt_data = self.gps.link.pid_rte_wpt_data
         if all(isinstance(datatype, mod_datatype.DataType) for datatype in routes):
             for datatype in routes:
                 if isinstance(datatype, mod_datatype.RteHdr):
-                    pid = self.gps.link.pid_rte_hdr
-                elif isinstance(datatype, mod_datatype.mod_datatype.Wpt):
-                    pid = self.gps.link.pid_rte_wpt_data
+                    pid = pid_rte_hdr
+                elif isinstance(datatype, mod_datatype.Wpt):
+                    pid = pid_rte_wpt_data
                 else:
                     raise mod_error.ProtocolError("Invalid datatype: expected {self.datatypes[0].__name__} or {self.datatypes[1].__name__}")
                 packet = {'id': pid, 'data': datatype}
                 packets.append(packet)
         elif all(isinstance(datatype, dict) for route in routes for datatype in route):
+            header_type, point_type = self.datatypes[:2]
             for route in routes:
                 header = route[0]
                 points = route[1:]
-                pid = self.gps.link.pid_rte_hdr
-                datatype = self.datatypes[0](**header)
-                packet = {'id': pid, 'data': datatype}
+                datatype = header_type(**header)
+                packet = {'id': pid_rte_hdr, 'data': datatype}
                 packets.append(packet)
                 for point in points:
-                    pid = self.gps.link.pid_rte_wpt_data
-                    datatype = self.datatypes[0](**point)
-                    packet = {'id': pid, 'data': datatype}
+                    datatype = point_type(**point)
+                    packet = {'id': pid_rte_wpt_data, 'data': datatype}
                     packets.append(packet)
         return TransferProtocol.put_data(self,
                                          self.gps.command.cmnd_transfer_rte,
@@ -685,35 +696,38 @@ class A201(TransferProtocol):
 
     def put_data(self, routes, callback=None):
         packets = []
+        pid_rte_hdr = self.gps.link.pid_rte_hdr
+        pid_rte_wpt_data = self.gps.link.pid_rte_wpt_data
+        pid_rte_link_data = self.gps.link.pid_rte_link_data
         if all(isinstance(datatype, mod_datatype.DataType) for route in routes for datatype in route):
             for route in routes:
                 for datatype in route:
                     if isinstance(datatype, mod_datatype.RteHdr):
-                        pid = self.gps.link.pid_rte_hdr
+                        pid = pid_rte_hdr
                     elif isinstance(datatype, mod_datatype.Wpt):
-                        pid = self.gps.link.pid_rte_wpt_data
+                        pid = pid_rte_wpt_data
                     elif isinstance(datatype, mod_datatype.RteLink):
-                        pid = self.gps.link.pid_rte_link_data
+                        pid = pid_rte_link_data
                     else:
                         raise mod_error.ProtocolError("Invalid datatype: expected {self.datatypes[0].__name__}, {self.datatypes[1].__name__}, or {self.datatypes[2].__name__}")
                     packet = {'id': pid, 'data': datatype}
                     packets.append(packet)
         elif all(isinstance(datatype, dict) for route in routes for datatype in route):
+            header_type, point_type, link_type = self.datatypes[:3]
             for route in routes:
                 header = route[0]
                 points = route[1:]
-                pid = self.gps.link.pid_rte_hdr
-                datatype = self.datatypes[0](**header)
-                packet = {'id': pid, 'data': datatype}
+                datatype = header_type(**header)
+                packet = {'id': pid_rte_hdr, 'data': datatype}
                 packets.append(packet)
-                is_even = lambda x: x % 2 == 0
                 for idx, point in enumerate(points):
-                    if is_even(idx):
-                        pid = self.gps.link.pid_rte_wpt_data
-                        datatype = self.datatypes[1](**point)
+                    # Route points and links alternate
+                    if idx % 2 == 0:
+                        pid = pid_rte_wpt_data
+                        datatype = point_type(**point)
                     else:
-                        pid = self.gps.link.pid_rte_link_data
-                        datatype = self.datatypes[2](**point)
+                        pid = pid_rte_link_data
+                        datatype = link_type(**point)
                     packet = {'id': pid, 'data': datatype}
                     packets.append(packet)
         else:
@@ -1085,12 +1099,14 @@ class A800(TransferProtocol):
     def get_data(self, callback=None):
         pids = [self.gps.link.pid_pvt_data,
                 self.gps.link.pid_satellite_data]
-        self.datatypes.append(mod_datatype.Satellite)
+        # The undocumented Satellite datatype is not among the reported
+        # datatypes
+        datatypes = [self.datatypes[0], mod_datatype.Satellite]
         packet = self.gps.link.read_packet()
         pid = packet['id']
         if pid in pids:
             i = pids.index(pid)
-            datatype = self.datatypes[i]()
+            datatype = datatypes[i]()
             mod_logger.log.info(f"Datatype {type(datatype).__name__}")
             datatype.unpack(packet['data'])
             mod_logger.log.info(f"{str(datatype)}")
@@ -1203,7 +1219,7 @@ class A900:
             datatype.unpack(packet['data'])
             packet_count = datatype.records
             mod_logger.log.info(f"{type(self).__name__}: Expecting {packet_count} records")
-            data = bytes()
+            data = bytearray()
             for idx in range(packet_count):
                 packet = self.gps.link.expect_packet(self.gps.link.pid_mem_chunk)
                 datatype = mod_datatype.MemRecord()
@@ -1211,7 +1227,7 @@ class A900:
                 data += datatype.chunk
                 if callback:
                     callback(datatype, idx+1, packet_count)
-            return data
+            return bytes(data)
 
     def _write_file(self, file, chunk_size=250, callback=None):
         mod_logger.log.info(f"Upload map {file}")
@@ -48,7 +48,6 @@ from . import logger as mod_logger
 from . import datatype as mod_datatype
 from . import gpsd as GPSD
 from . import gpx as GPX
-from . import fit as FIT
 
 logging_levels = {
     0: logging.NOTSET,
@@ -84,19 +83,27 @@ def to_pixel_data(pixel_values, bpp):
     if 8 % bpp != 0:
         sys.exit(f"{bpp}-bit color depth is not supported")
     ppb = 8 // bpp
-    pixel_array = list()
+    mask = pow(2, bpp) - 1
+    offsets = list(reversed(range(0, 8, bpp)))
+    # Map the pixel values of all 256 possible bytes to their byte, so that
+    # most bytes can simply be looked up
+    table = { tuple(byte >> offset & mask for offset in offsets): byte for byte in range(256) }
+    pixel_array = bytearray()
     for pos in range(0, len(pixel_values), ppb):
-        values = pixel_values[pos:pos+ppb]
-        pixels = 0
-        # Pixels are stored from left to right, so the bits of the first pixel
-        # are shifted to the far left
-        for idx, value in enumerate(reversed(values)):
-            if value.bit_length() > bpp:
-                sys.exit(f"Integer {value} cannot be represented by {bpp} bits")
-            offset = idx * bpp
-            pixels = pixels + (value << offset)
+        values = tuple(pixel_values[pos:pos+ppb])
+        pixels = table.get(values)
+        if pixels is None:
+            # The values are either incomplete or invalid
+            pixels = 0
+            # Pixels are stored from left to right, so the bits of the first
+            # pixel are shifted to the far left
+            for idx, value in enumerate(reversed(values)):
+                if value.bit_length() > bpp:
+                    sys.exit(f"Integer {value} cannot be represented by {bpp} bits")
+                offset = idx * bpp
+                pixels = pixels + (value << offset)
         pixel_array.append(pixels)
-    return bytearray(pixel_array)
+    return pixel_array
 
 def to_pixel_values(pixel_array, bpp):
     """Returns the contents of this image as a list of pixel values.
@@ -111,14 +118,14 @@ def to_pixel_values(pixel_array, bpp):
     """
     if 8 % bpp != 0:
         sys.exit(f"{bpp}-bit color depth is not supported")
-    pixel_values = []
     # Calculate the bitmask, that is the maximum integer that can be
     # represented by the number of bits per pixel
     mask = pow(2, bpp) - 1
-    for byte in pixel_array:
-        for offset in reversed(range(0, 8, bpp)):
-            value = byte >> offset & mask
-            pixel_values.append(value)
+    offsets = list(reversed(range(0, 8, bpp)))
+    # Unpack all 256 possible byte values once, so that the pixel values of
+    # each byte in the pixel array can simply be looked up
+    table = [ [ byte >> offset & mask for offset in offsets ] for byte in range(256) ]
+    pixel_values = [ value for byte in pixel_array for value in table[byte] ]
     return pixel_values
 
 def bmp_to_pil(bmp):
@@ -330,17 +337,15 @@ class Pygarmin:
         else:
             datatypes = self.gps.get_waypoints()
         if args.format == 'txt':
-            for datatype in datatypes:
-                args.filename.write(f"{str(datatype)}\n")
+            args.filename.writelines(f"{str(datatype)}\n" for datatype in datatypes)
         elif args.format == 'garmin':
-            for datatype in datatypes:
-                args.filename.write(f"{repr(datatype)}\n")
+            args.filename.writelines(f"{repr(datatype)}\n" for datatype in datatypes)
         elif args.format == 'json':
             waypoints = [datatype.get_dict() for datatype in datatypes]
             json.dump(waypoints, args.filename, cls=BytesEncoder)
         elif args.format == 'gpx':
             gpx_waypoints = GPX.GPXWaypoints(datatypes)
-            args.filename.write(f"{gpx_waypoints.gpx.to_xml()}\n")
+            print(gpx_waypoints.gpx.to_xml(), file=args.filename)
         else:
             sys.exit(f"Output format {args.format} is not supported")
 
@@ -371,11 +376,9 @@ class Pygarmin:
         else:
             datatypes = self.gps.get_routes()
         if args.format == 'txt':
-            for datatype in datatypes:
-                args.filename.write(f"{str(datatype)}\n")
+            args.filename.writelines(f"{str(datatype)}\n" for datatype in datatypes)
         elif args.format == 'garmin':
-            for datatype in datatypes:
-                args.filename.write(f"{repr(datatype)}\n")
+            args.filename.writelines(f"{repr(datatype)}\n" for datatype in datatypes)
         else:
             if any(isinstance(datatype, mod_datatype.RteHdr) for datatype in datatypes):
                 # Route headers and associated points are grouped
@@ -391,7 +394,7 @@ class Pygarmin:
                 json.dump([[datatype.get_dict() for datatype in route] for route in routes], args.filename, cls=BytesEncoder)
             elif args.format == 'gpx':
                 gpx_routes = GPX.GPXRoutes(routes)
-                args.filename.write(f"{gpx_routes.gpx.to_xml()}\n")
+                print(gpx_routes.gpx.to_xml(), file=args.filename)
             else:
                 sys.exit(f"Output format {args.format} is not supported")
 
@@ -422,11 +425,9 @@ class Pygarmin:
         else:
             datatypes = self.gps.get_tracks()
         if args.format == 'txt':
-            for point in datatypes:
-                args.filename.write(f"{str(point)}\n")
+            args.filename.writelines(f"{str(point)}\n" for point in datatypes)
         elif args.format == 'garmin':
-            for point in datatypes:
-                args.filename.write(f"{repr(point)}\n")
+            args.filename.writelines(f"{repr(point)}\n" for point in datatypes)
         else:
             if any(isinstance(datatype, mod_datatype.TrkHdr) for datatype in datatypes):
                 # Track headers and associated points are grouped
@@ -438,13 +439,13 @@ class Pygarmin:
                         tracks[-1].append(datatype)
             else:
                 tracks = [datatypes]
-        if args.format == 'json':
+            if args.format == 'json':
                 json.dump([[datatype.get_dict() for datatype in track] for track in tracks], args.filename, cls=BytesEncoder)
-        elif args.format == 'gpx':
-            gpx_tracks = GPX.GPXTracks(tracks)
-            args.filename.write(f"{gpx_tracks.gpx.to_xml()}\n")
-        else:
-            sys.exit(f"Output format {args.format} is not supported")
+            elif args.format == 'gpx':
+                gpx_tracks = GPX.GPXTracks(tracks)
+                print(gpx_tracks.gpx.to_xml(), file=args.filename)
+            else:
+                sys.exit(f"Output format {args.format} is not supported")
 
     def put_tracks(self, args):
         if args.format == 'garmin':
@@ -473,17 +474,15 @@ class Pygarmin:
         else:
             datatypes = self.gps.get_proximities()
         if args.format == 'txt':
-            for datatype in datatypes:
-                args.filename.write(f"{str(datatype)}\n")
+            args.filename.writelines(f"{str(datatype)}\n" for datatype in datatypes)
         elif args.format == 'garmin':
-            for datatype in datatypes:
-                args.filename.write(f"{repr(datatype)}\n")
+            args.filename.writelines(f"{repr(datatype)}\n" for datatype in datatypes)
         elif args.format == 'json':
             proximities = [datatype.get_dict() for datatype in datatypes]
             json.dump(proximities, args.filename, cls=BytesEncoder)
         elif args.format == 'gpx':
             gpx_proximities = GPX.GPXWaypoints(datatypes)
-            args.filename.write(f"{gpx_proximities.gpx.to_xml()}\n")
+            print(gpx_proximities.gpx.to_xml(), file=args.filename)
         else:
             sys.exit(f"Output format {args.format} is not supported")
 
@@ -514,11 +513,9 @@ class Pygarmin:
         else:
             datatypes = self.gps.get_almanac()
         if args.format == 'txt':
-            for datatype in datatypes:
-                args.filename.write(f"{str(datatype)}\n")
+            args.filename.writelines(f"{str(datatype)}\n" for datatype in datatypes)
         elif args.format == 'garmin':
-            for datatype in datatypes:
-                args.filename.write(f"{repr(datatype)}\n")
+            args.filename.writelines(f"{repr(datatype)}\n" for datatype in datatypes)
         elif args.format == 'json':
             almanacs = [datatype.get_dict() for datatype in datatypes]
             json.dump(almanacs, args.filename, cls=BytesEncoder)
@@ -582,13 +579,12 @@ class Pygarmin:
                 laps = self.gps.get_laps(callback=progress_bar.update_to)
         else:
             laps = self.gps.get_laps()
-        for lap in laps:
-            if args.format == 'txt':
-                args.filename.write(f"{str(lap)}\n")
-            elif args.format == 'garmin':
-                args.filename.write(f"{repr(lap)}\n")
-            else:
-                sys.exit(f"Output format {args.format} is not supported")
+        if args.format == 'txt':
+            args.filename.writelines(f"{str(lap)}\n" for lap in laps)
+        elif args.format == 'garmin':
+            args.filename.writelines(f"{repr(lap)}\n" for lap in laps)
+        else:
+            sys.exit(f"Output format {args.format} is not supported")
 
     def get_runs(self, args):
         if args.progress:
@@ -639,6 +635,9 @@ class Pygarmin:
                 datatypes.extend([repr(point) for point in run[2]])
                 data = '\n'.join(datatypes)
             elif args.format == 'fit':
+                # fit_tool takes a long time to import, so the FIT encoder is
+                # only imported when a FIT file is written
+                from . import fit as FIT
                 activity = [run]
                 fit = FIT.FITActivity(self.gps, activity)
                 fit_file = fit.build()
@@ -684,6 +683,7 @@ class Pygarmin:
             elif args.format == 'garmin':
                 data = repr(datatype) + '\n'
             elif args.format == 'fit':
+                from . import fit as FIT
                 fit = FIT.FITWorkout(self.gps, datatype)
                 fit_file = fit.build()
                 data = fit_file.to_bytes()
@@ -769,6 +769,7 @@ class Pygarmin:
                 datatypes.extend([repr(point) for point in course[3]])
                 data = '\n'.join(datatypes)
             elif args.format == 'fit':
+                from . import fit as FIT
                 fit = FIT.FITCourse(self.gps, course)
                 fit_file = fit.build()
                 data = fit_file.to_bytes()
@@ -868,6 +869,7 @@ class Pygarmin:
             else:
                 mod_logger.log.warning(f"Unknown multisport value {multisport}. Ignoring...")
         if args.format == 'fit':
+            from . import fit as FIT
             for idx, activity in enumerate(activities):
                 fit = FIT.FITActivity(self.gps, activity)
                 fit_file = fit.build()